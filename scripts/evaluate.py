@@ -6,33 +6,63 @@ This script evaluates the performance of an entropy-based strategy for solving W
 puzzles and generates a comprehensive performance report.
 """
 
-import contextlib
-import io
+import multiprocessing
 import os
-from typing import List, Dict, Any
-import json
+from concurrent.futures import ProcessPoolExecutor
+from heapq import nlargest
+from typing import List, Dict, Any, Optional, Tuple
+import orjson
 import numpy as np
 import matplotlib.pyplot as plt
 from tqdm import tqdm
 
-from src.wordle import Wordle
 from src.strategies import EntropyBasedStrategy, MinimaxBasedStrategy, FrequencyBasedStrategy, HybridStrategy
+from src.strategies import encode_words, build_pattern_table, load_pattern_table, pattern_table_path
+
+# Same layout as json.dump(..., indent=2); NumPy scalars/arrays and the integer
+# keys of the attempt distribution are serialized natively
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
 
 def load_word_list(filepath: str) -> List[str]:
     """Load and return a list of words from a file."""
+    # One read and a single split in C, rather than a strip() per line
     with open(filepath, "r") as file:
-        return [line.strip() for line in file]
+        return file.read().split()
+
+
+# Per-worker strategy, built once by _init_worker
+_worker_strategy = None
+
+
+def _init_worker(strategy_cls: type, allowed_words_path: str) -> None:
+    """Build the strategy of a worker process once, before it solves any puzzle."""
+    global _worker_strategy
+    
+    _worker_strategy = strategy_cls(vocabulary=allowed_words_path, verbose=False)
+
+
+def _solve_batch(words: List[str]) -> List[Tuple[str, int]]:
+    """Solve a batch of puzzles in a worker process and return the attempts each took."""
+    solved = _worker_strategy.solve_batch(words)
+    
+    return [(word, attempts) for word, (_, attempts) in zip(words, solved)]
 
 
-def evaluate_strategy(game: Wordle, strategy: Any, target_words: List[str]) -> Dict[str, Any]:
+def evaluate_strategy(strategy_cls: type, target_words: List[str], allowed_words_path: str,
+                      processes: Optional[int] = None) -> Dict[str, Any]:
     """
     Evaluate the strategy's performance against all target words.
     
+    Puzzles are split into a few large batches, solved in parallel by a pool
+    of worker processes. Within a batch, games that reach the same state share
+    the work of choosing their next guess.
+    
     Args:
-        game: Wordle game instance
-        strategy: Strategy instance used to solve the game
+        strategy_cls: Strategy class used to solve the game
         target_words: List of target words to test against
+        allowed_words_path: Path to the list of allowed guesses
+        processes: Number of worker processes (defaults to the CPU count)
         
     Returns:
         Dictionary containing performance metrics
@@ -44,36 +74,39 @@ def evaluate_strategy(game: Wordle, strategy: Any, target_words: List[str]) -> D
         "word_results": {}
     }
     
-    print(f"Evaluating strategy against {len(target_words)} target words...")
-    
-    for word in tqdm(target_words):
-        game.reset_game(word)
-        
-        # Suppress output from the strategy
-        with contextlib.redirect_stdout(io.StringIO()):
-            strategy.solve(game)
-        
-        results["attempts"].append(game.attempts)
-        
-        # Store individual word results
-        results["word_results"][word] = {
-            "attempts": game.attempts,
-            "success": game.attempts <= 6  # Standard Wordle allows 6 attempts
-        }
-        
-        if game.attempts > 6:
-            results["failures"] += 1
-    
-    total_words = len(target_words)
-    results["success_rate"] = (total_words - results["failures"]) / total_words * 100
-    results["average_attempts"] = sum(results["attempts"]) / total_words
-    results["median_attempts"] = np.median(results["attempts"])
+    print(f"Evaluating {strategy_cls.__name__} against {len(target_words)} target words...")
+    
+    # Larger batches share more work; a few per process keep the progress bar moving
+    processes = processes or os.cpu_count() or 1
+    batch_size = -(-len(target_words) // (processes * 4))
+    batches = [target_words[i:i + batch_size] for i in range(0, len(target_words), batch_size)]
+    
+    with multiprocessing.Pool(processes, initializer=_init_worker,
+                              initargs=(strategy_cls, allowed_words_path)) as pool:
+        # imap keeps the target order, so reports are stable across runs
+        with tqdm(total=len(target_words)) as progress:
+            for solved in pool.imap(_solve_batch, batches):
+                for word, attempts in solved:
+                    results["attempts"].append(attempts)
+                    
+                    # Store individual word results
+                    results["word_results"][word] = {
+                        "attempts": attempts,
+                        "success": attempts <= 6  # Standard Wordle allows 6 attempts
+                    }
+                progress.update(len(solved))
+    
+    # Summarise all games in a few passes over one array
+    attempts = np.asarray(results["attempts"], dtype=np.int32)
+    counts = np.bincount(attempts)
+    
+    results["failures"] = (attempts > 6).sum()
+    results["success_rate"] = (attempts.size - results["failures"]) / attempts.size * 100
+    results["average_attempts"] = attempts.mean()
+    results["median_attempts"] = np.median(attempts)
     
     # Count frequency of each number of attempts
-    attempt_counts = {}
-    for i in range(1, max(results["attempts"]) + 1):
-        attempt_counts[i] = results["attempts"].count(i)
-    results["attempt_distribution"] = attempt_counts
+    results["attempt_distribution"] = {i: counts[i] for i in range(1, counts.size)}
     
     return results
 
@@ -89,14 +122,13 @@ def generate_plots(results: Dict[str, Any], output_dir: str = "output") -> None:
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Plot 1: Attempts distribution
-    plt.figure(figsize=(10, 6))
+    attempts = np.asarray(results["attempts"])
+    counts = np.bincount(attempts, minlength=7)
     
-    attempts_dist = results["attempt_distribution"]
-    attempts = list(attempts_dist.keys())
-    counts = list(attempts_dist.values())
+    # Plot 1: Attempts distribution
+    fig = plt.figure(figsize=(10, 6))
     
-    plt.bar(attempts, counts)
+    plt.bar(range(1, counts.size), counts[1:])
     plt.axvline(x=6.5, color='r', linestyle='--', label='Wordle Limit (6)')
     plt.xlabel('Number of Attempts')
     plt.ylabel('Count')
@@ -104,28 +136,21 @@ def generate_plots(results: Dict[str, Any], output_dir: str = "output") -> None:
     plt.grid(axis='y', alpha=0.3)
     plt.legend()
     plt.savefig(f"{output_dir}/attempts_distribution.png")
+    plt.close(fig)
     
-    # Plot 2: Cumulative success rate
-    plt.figure(figsize=(10, 6))
-    
-    cumulative_success = []
-    total = len(results["attempts"])
-    running_sum = 0
+    # Plot 2: Cumulative success rate within the standard Wordle limit
+    fig = plt.figure(figsize=(10, 6))
     
-    for i in sorted(attempts_dist.keys()):
-        running_sum += attempts_dist[i]
-        if i <= 6:  # Standard Wordle limit
-            cumulative_success.append(running_sum / total * 100)
+    cumulative_success = np.cumsum(counts[1:7]) / attempts.size * 100
     
-    plt.plot(range(1, len(cumulative_success) + 1), cumulative_success, marker='o')
+    plt.plot(range(1, 7), cumulative_success, marker='o')
     plt.xlabel('Maximum Attempts')
     plt.ylabel('Success Rate (%)')
     plt.title('Cumulative Success Rate by Maximum Attempts Allowed')
     plt.grid(alpha=0.3)
-    plt.xticks(range(1, len(cumulative_success) + 1))
+    plt.xticks(range(1, 7))
     plt.savefig(f"{output_dir}/cumulative_success.png")
-    
-    plt.close('all')
+    plt.close(fig)
 
 
 def save_report(results: Dict[str, Any], output_dir: str = "output") -> str:
@@ -142,8 +167,8 @@ def save_report(results: Dict[str, Any], output_dir: str = "output") -> str:
     os.makedirs(output_dir, exist_ok=True)
     
     # Save raw results as JSON
-    with open(f"{output_dir}/strategy_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+    with open(f"{output_dir}/strategy_results.json", "wb") as f:
+        f.write(orjson.dumps(results, option=JSON_OPTIONS))
     
     # Create markdown report
     report_path = f"{output_dir}/performance_report.md"
@@ -176,11 +201,11 @@ def save_report(results: Dict[str, Any], output_dir: str = "output") -> str:
         f.write("These words required the most attempts to solve:\n\n")
         
         # Get the 10 words that required the most attempts
-        hardest_words = sorted(
+        hardest_words = nlargest(
+            10,
             results["word_results"].items(), 
-            key=lambda x: x[1]["attempts"], 
-            reverse=True
-        )[:10]
+            key=lambda x: x[1]["attempts"]
+        )
         
         f.write("| Word | Attempts |\n")
         f.write("|------|----------|\n")
@@ -270,8 +295,8 @@ def save_comparative_report(all_results: Dict[str, Dict[str, Any]], output_dir:
     os.makedirs(output_dir, exist_ok=True)
     
     # Save raw results as JSON
-    with open(f"{output_dir}/all_strategies_results.json", "w") as f:
-        json.dump(all_results, f, indent=2)
+    with open(f"{output_dir}/all_strategies_results.json", "wb") as f:
+        f.write(orjson.dumps(all_results, option=JSON_OPTIONS))
     
     # Create markdown report
     report_path = f"{output_dir}/comparative_performance_report.md"
@@ -312,11 +337,11 @@ def save_comparative_report(all_results: Dict[str, Dict[str, Any]], output_dir:
             f.write("These words required the most attempts to solve:\n\n")
             
             # Get the 10 words that required the most attempts
-            hardest_words = sorted(
+            hardest_words = nlargest(
+                10,
                 results["word_results"].items(), 
-                key=lambda x: x[1]["attempts"], 
-                reverse=True
-            )[:10]
+                key=lambda x: x[1]["attempts"]
+            )
             
             f.write("| Word | Attempts |\n")
             f.write("|------|----------|\n")
@@ -334,54 +359,66 @@ def main():
     possible_words_path = "data/possible_words.txt"
     base_output_dir = "output"
     
-    # Initialize the game
-    game = Wordle(allowed_words=allowed_words_path, possible_words=possible_words_path)
+    # Precompute the feedback of every (target, guess) pair once, here, rather
+    # than letting every worker's strategy build its own copy on first use
+    vocab_arr, vocab_counts = encode_words([word.lower() for word in load_word_list(allowed_words_path)])
+    table_path = pattern_table_path(vocab_arr)
+    if load_pattern_table(table_path, vocab_arr) is None:
+        print("Building the feedback pattern table...")
+        build_pattern_table(vocab_arr, vocab_counts, table_path)
     
     # Load target words
     target_words = load_word_list(possible_words_path)
     
     # Define strategies to evaluate
     strategies = {
-        # "entropy_strategy": EntropyBasedStrategy(),
-        # "minimax_strategy": MinimaxBasedStrategy(),
-        # "frequency_strategy": FrequencyBasedStrategy(),
-        "hybrid_strategy": HybridStrategy()
+        # "entropy_strategy": EntropyBasedStrategy,
+        # "minimax_strategy": MinimaxBasedStrategy,
+        # "frequency_strategy": FrequencyBasedStrategy,
+        "hybrid_strategy": HybridStrategy
     }
     
     # Store results for all strategies
     all_results = {}
     
-    with open("output/entropy_strategy/strategy_results.json", "r") as f:
-        entropy_results = json.load(f)
+    with open("output/entropy_strategy/strategy_results.json", "rb") as f:
+        entropy_results = orjson.loads(f.read())
     
-    with open("output/minimax_strategy/strategy_results.json", "r") as f:
-        minimax_results = json.load(f)
+    with open("output/minimax_strategy/strategy_results.json", "rb") as f:
+        minimax_results = orjson.loads(f.read())
     
-    with open("output/frequency_strategy/strategy_results.json", "r") as f:
-        frequency_results = json.load(f)
+    with open("output/frequency_strategy/strategy_results.json", "rb") as f:
+        frequency_results = orjson.loads(f.read())
     
     all_results["entropy_strategy"] = entropy_results
     all_results["minimax_strategy"] = minimax_results
     all_results["frequency_strategy"] = frequency_results
     
-    # Evaluate each strategy
-    for strategy_name, strategy in strategies.items():
-        print(f"\nEvaluating {strategy_name}...")
-        
-        # Create strategy-specific output directory
-        strategy_output_dir = os.path.join(base_output_dir, strategy_name)
-        
-        # Evaluate strategy performance
-        results = evaluate_strategy(game, strategy, target_words)
-        all_results[strategy_name] = results
-        
-        # Generate individual plots and save report
-        generate_plots(results, strategy_output_dir)
-        report_path = save_report(results, strategy_output_dir)
+    # Evaluate the strategies in parallel, splitting the cores between their
+    # per-puzzle worker pools
+    processes = max(1, (os.cpu_count() or 1) // len(strategies))
+    with ProcessPoolExecutor(max_workers=len(strategies)) as executor:
+        futures = {
+            strategy_name: executor.submit(evaluate_strategy, strategy_cls, target_words,
+                                           allowed_words_path, processes)
+            for strategy_name, strategy_cls in strategies.items()
+        }
         
-        print(f"Evaluation of {strategy_name} completed successfully.")
-        print(f"Performance report saved to {report_path}")
-        print(f"Raw data saved to {strategy_output_dir}/strategy_results.json")
+        for strategy_name, future in futures.items():
+            # Create strategy-specific output directory
+            strategy_output_dir = os.path.join(base_output_dir, strategy_name)
+            
+            # Wait for the strategy's evaluation to finish
+            results = future.result()
+            all_results[strategy_name] = results
+            
+            # Generate individual plots and save report
+            generate_plots(results, strategy_output_dir)
+            report_path = save_report(results, strategy_output_dir)
+            
+            print(f"Evaluation of {strategy_name} completed successfully.")
+            print(f"Performance report saved to {report_path}")
+            print(f"Raw data saved to {strategy_output_dir}/strategy_results.json")
     
     # Generate comparative plots and report
     generate_comparative_plots(all_results, base_output_dir)
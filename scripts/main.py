@@ -24,7 +24,7 @@ def main():
     game = Wordle(allowed_words="data/allowed_words.txt", possible_words="data/possible_words.txt")
     
     # choose strategy
-    strategy = HybridStrategy()
+    strategy = HybridStrategy(verbose=True)
     
     # Load word lists
     with open("data/allowed_words.txt", "r") as f:
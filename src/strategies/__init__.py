@@ -2,5 +2,7 @@ from .entropy_strategy import EntropyBasedStrategy
 from .minimax_strategy import MinimaxBasedStrategy
 from .frequency_strategy import FrequencyBasedStrategy
 from .hybrid_strategy import HybridStrategy
+from ._kernels import encode_words, build_pattern_table, load_pattern_table, pattern_table_path
 
-__all__ = ['EntropyBasedStrategy', 'MinimaxBasedStrategy', 'FrequencyBasedStrategy', 'HybridStrategy']
\ No newline at end of file
+__all__ = ['EntropyBasedStrategy', 'MinimaxBasedStrategy', 'FrequencyBasedStrategy', 'HybridStrategy',
+           'encode_words', 'build_pattern_table', 'load_pattern_table', 'pattern_table_path']
\ No newline at end of file
@@ -0,0 +1,495 @@
+import hashlib
+import os
+from itertools import product
+import numpy as np
+
+# Number of (candidate, target) pairs scored per block, keeps the intermediate
+# arrays of pattern_matrix at a few MB regardless of the vocabulary size
+BLOCK_CELLS = 1 << 20
+
+# Upper limit on candidates per block, so the search can stop early once a
+# candidate reaches the best possible score
+BLOCK_GUESSES = 1024
+
+# Bytes before the table in a pattern table file: the digest of the vocabulary it
+# was built for, see vocabulary_digest
+TABLE_HEADER_SIZE = 32
+
+# Feedback string of every pattern code: base 3 with "_" = 0, "Y" = 1, "G" = 2,
+# first letter most significant
+FEEDBACK_STRINGS = [''.join(signs) for signs in product('_YG', repeat=5)]
+FEEDBACK_CODES = {feedback: code for code, feedback in enumerate(FEEDBACK_STRINGS)}
+
+
+def encode_words(words):
+    """
+    Encode lowercase 5-letter words as NumPy arrays.
+    
+    Args:
+        words (list): Words to encode
+    
+    Returns:
+        tuple: (N, 5) uint8 letter codes (0-25) and (N, 26) uint8 letter counts
+    """
+    word_arr = np.frombuffer(''.join(words).encode(), dtype=np.uint8).reshape(-1, 5) - ord('a')
+    
+    word_counts = np.zeros((len(words), 26), dtype=np.uint8)
+    np.add.at(word_counts, (np.arange(len(words))[:, None], word_arr), 1)
+    
+    return word_arr, word_counts
+
+
+def pack_words(word_arr):
+    """
+    Pack the letter codes of each word into one integer, byte i holding letter i.
+    
+    Args:
+        word_arr (np.ndarray): (N, 5) letter codes
+    
+    Returns:
+        np.ndarray: (N,) uint64 packed words
+    """
+    shifts = np.arange(5, dtype=np.uint64) * np.uint64(8)
+    return np.bitwise_or.reduce(word_arr.astype(np.uint64) << shifts, axis=1)
+
+
+def repeated_letters(word_arr):
+    """
+    Flag the positions whose letter already occurred earlier in the word.
+    
+    Args:
+        word_arr (np.ndarray): (N, 5) letter codes
+    
+    Returns:
+        np.ndarray: (N, 5) bool, True where the letter is a repeat
+    """
+    # Compare every position with every earlier one: (N, 5, 5), keep j < i
+    same_letter = word_arr[:, :, None] == word_arr[:, None, :]
+    return (same_letter & np.tri(5, k=-1, dtype=bool)).any(axis=2)
+
+
+def position_frequencies(word_arr):
+    """
+    Count how often each letter occurs at each position.
+    
+    Args:
+        word_arr (np.ndarray): (M, 5) letter codes
+    
+    Returns:
+        np.ndarray: (5, 26) number of words with each letter at each position
+    """
+    # Shift every position into its own block of 26 bins so one bincount covers all
+    offsets = np.arange(5) * 26
+    return np.bincount((word_arr + offsets).ravel(), minlength=5 * 26).reshape(5, 26)
+
+
+def frequency_scores(vocab_arr, vocab_repeats, frequencies, penalty=0.8):
+    """
+    Score every word by the positional frequencies of its letters.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+        vocab_repeats (np.ndarray): (N, 5) repeated-letter flags from repeated_letters
+        frequencies (np.ndarray): (5, 26) counts from position_frequencies
+        penalty (float): Factor applied to the running score at each repeated letter
+    
+    Returns:
+        np.ndarray: (N,) float scores
+    """
+    # Same sequence of additions and penalties as scoring one word at a time,
+    # applied one position at a time to the whole vocabulary
+    scores = np.zeros(len(vocab_arr))
+    for i in range(5):
+        scores += frequencies[i, vocab_arr[:, i]]
+        scores[vocab_repeats[:, i]] *= penalty
+    
+    return scores
+
+
+def feedback_code(guess, target):
+    """
+    Pattern code of a single (guess, target) pair.
+    
+    Args:
+        guess (sequence): 5 letter codes (0-25) of the guess
+        target (sequence): 5 letter codes (0-25) of the target
+    
+    Returns:
+        int: Feedback pattern in [0, 243), see FEEDBACK_STRINGS
+    """
+    # Count occurrences of each letter in the target word
+    letter_count = [0] * 26
+    for letter in target:
+        letter_count[letter] += 1
+    
+    # First pass: Mark correct positions
+    greens = [guess[i] == target[i] for i in range(5)]
+    for i in range(5):
+        if greens[i]:
+            letter_count[guess[i]] -= 1
+    
+    # Second pass: Mark correct letters in wrong positions
+    code = 0
+    for i in range(5):
+        if greens[i]:
+            mark = 2
+        elif letter_count[guess[i]] > 0:
+            letter_count[guess[i]] -= 1
+            mark = 1
+        else:
+            mark = 0
+        code = code * 3 + mark
+    
+    return code
+
+
+def pattern_matrix(guesses, target_arr, target_counts):
+    """
+    Vectorized version of AbstractStrategy._generate_feedback: compare many
+    guesses against many targets at once.
+    
+    Args:
+        guesses (np.ndarray): (G, 5) letter codes of the guesses
+        target_arr (np.ndarray): (M, 5) letter codes of the targets
+        target_counts (np.ndarray): (M, 26) letter counts of the targets
+    
+    Returns:
+        np.ndarray: (G, M) feedback patterns encoded in base 3
+                    ("_" = 0, "Y" = 1, "G" = 2, first letter most significant)
+    """
+    same_letter = guesses[:, :, None] == guesses[:, None, :]
+    
+    # First pass: Mark correct positions
+    greens = [guesses[:, i, None] == target_arr[None, :, i] for i in range(5)]
+    
+    # Occurrences of each guess letter in the target not consumed by a green
+    remaining = []
+    for i in range(5):
+        left = target_counts[:, guesses[:, i]].T.astype(np.int16)
+        for j in range(5):
+            left -= greens[j] & same_letter[:, i, j, None]
+        remaining.append(left)
+    
+    # Second pass: Mark correct letters in wrong positions, left to right
+    codes = np.zeros((len(guesses), len(target_arr)), dtype=np.uint8)
+    for i in range(5):
+        yellows = ~greens[i] & (remaining[i] > 0)
+        
+        # A yellow uses up one occurrence for the later positions with the same letter
+        for j in range(i + 1, 5):
+            remaining[j] -= yellows & same_letter[:, i, j, None]
+        
+        codes = codes * 3 + greens[i] * np.uint8(2) + yellows
+    
+    return codes
+
+
+def pattern_histograms(patterns):
+    """
+    Count the feedback patterns of each row of a pattern matrix.
+    
+    Args:
+        patterns (np.ndarray): (G, M) pattern matrix from pattern_matrix
+    
+    Returns:
+        np.ndarray: (G, 243) number of targets producing each pattern
+    """
+    # Shift every row into its own block of 243 bins so one bincount covers all rows
+    offsets = np.arange(len(patterns))[:, None] * 243
+    counts = np.bincount((patterns + offsets).ravel(), minlength=len(patterns) * 243)
+    return counts.reshape(-1, 243)
+
+
+def xlogx_table(size):
+    """
+    Lookup table of c * log2(c) for every count c in [0, size].
+    
+    Args:
+        size (int): Largest count that will be looked up
+    
+    Returns:
+        np.ndarray: (size + 1,) float64 table, with 0 * log2(0) taken as 0
+    """
+    counts = np.arange(size + 1, dtype=np.float64)
+    table = np.zeros(size + 1)
+    table[1:] = counts[1:] * np.log2(counts[1:])
+    return table
+
+
+def split_costs(histograms, xlogx):
+    """
+    sum(c * log2(c)) over the patterns of each row of pattern histograms.
+    
+    With M targets and c targets per pattern, the expected entropy
+    -sum(c/M * log2(c/M)) equals log2(M) - sum(c * log2(c)) / M. M is the same
+    for every guess of a turn, so the guess with the lowest cost is the one with
+    the highest entropy, and the constant part never has to be computed.
+    
+    Args:
+        histograms (np.ndarray): (G, 243) histograms from pattern_histograms
+        xlogx (np.ndarray): Table from xlogx_table, covering counts up to M
+    
+    Returns:
+        np.ndarray: (G,) cost of each guess
+    """
+    return xlogx[histograms].sum(axis=1)
+
+
+def vocabulary_digest(vocab_arr):
+    """
+    Fingerprint of a vocabulary: its words and their order.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+    
+    Returns:
+        bytes: SHA-256 digest, TABLE_HEADER_SIZE bytes long
+    """
+    return hashlib.sha256(np.ascontiguousarray(vocab_arr).tobytes()).digest()
+
+
+def pattern_table_path(vocab_arr, directory='cache'):
+    """
+    Default location of the pattern table of a vocabulary, so vocabularies
+    never share (and overwrite) each other's table.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+        directory (str): Directory holding the cached tables
+    
+    Returns:
+        str: Path named after the vocabulary's digest
+    """
+    return os.path.join(directory, f'patterns-{vocabulary_digest(vocab_arr).hex()[:16]}.u8')
+
+
+def build_pattern_table(vocab_arr, vocab_counts, path):
+    """
+    Precompute the feedback of every (target, guess) pair of the vocabulary
+    and store it on disk as a raw uint8 matrix, after a header holding the
+    vocabulary's digest.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+        vocab_counts (np.ndarray): (N, 26) letter counts of the vocabulary
+        path (str): Where to write the table
+    
+    Returns:
+        np.memmap: Read-only (N, N) table, indexed as table[target, guess]
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    size = len(vocab_arr)
+    
+    # Write under a temporary name and rename it into place, so processes that
+    # build or load the table at the same time never see a partial file
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(vocabulary_digest(vocab_arr))
+        file.truncate(TABLE_HEADER_SIZE + size * size)
+    table = np.memmap(tmp_path, dtype=np.uint8, mode='r+', offset=TABLE_HEADER_SIZE,
+                      shape=(size, size))
+    block = max(1, BLOCK_CELLS // size)
+    for start in range(0, size, block):
+        targets = slice(start, start + block)
+        table[targets] = pattern_matrix(vocab_arr, vocab_arr[targets], vocab_counts[targets]).T
+    table.flush()
+    del table
+    os.replace(tmp_path, path)
+    
+    return load_pattern_table(path, vocab_arr)
+
+
+def load_pattern_table(path, vocab_arr):
+    """
+    Open a table written by build_pattern_table.
+    
+    Args:
+        path (str): Location of the table
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary the table
+                                must have been built for
+    
+    Returns:
+        np.memmap: Read-only (N, N) table, or None if it is missing or was built
+                   for another vocabulary
+    """
+    size = len(vocab_arr)
+    if not os.path.exists(path) or os.path.getsize(path) != TABLE_HEADER_SIZE + size * size:
+        return None
+    
+    with open(path, 'rb') as file:
+        if file.read(TABLE_HEADER_SIZE) != vocabulary_digest(vocab_arr):
+            return None
+    
+    return np.memmap(path, dtype=np.uint8, mode='r', offset=TABLE_HEADER_SIZE, shape=(size, size))
+
+
+def iter_histograms(vocab_arr, vocab_counts, target_idx, candidate_idx, block_guesses=None,
+                    pattern_table=None):
+    """
+    Pattern histograms of the candidates against the targets, block by block,
+    so the full (candidates, targets) pattern matrix is never materialised.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+        vocab_counts (np.ndarray): (N, 26) letter counts of the vocabulary
+        target_idx (np.ndarray): (M,) vocabulary indices of the remaining targets
+        candidate_idx (np.ndarray): (G,) vocabulary indices of the candidates, in
+                                    the order they should be scored
+        block_guesses (int): Optional limit on the number of candidates per block
+        pattern_table (np.memmap): Optional table from build_pattern_table; the
+                                   patterns are then looked up instead of computed
+    
+    Yields:
+        tuple: (B,) candidate indices of the block and their (B, 243) histograms
+    """
+    if pattern_table is not None:
+        # One contiguous row per remaining target
+        target_rows = pattern_table[target_idx]
+    else:
+        target_arr = vocab_arr[target_idx]
+        target_counts = vocab_counts[target_idx]
+    
+    block = max(1, BLOCK_CELLS // len(target_idx))
+    if block_guesses is not None:
+        block = min(block, block_guesses)
+    
+    for start in range(0, len(candidate_idx), block):
+        block_idx = candidate_idx[start:start + block]
+        if pattern_table is not None:
+            patterns = target_rows[:, block_idx].T
+        else:
+            patterns = pattern_matrix(vocab_arr[block_idx], target_arr, target_counts)
+        yield block_idx, pattern_histograms(patterns)
+
+
+def ordered_candidates(skip_mask, target_idx, vocab_counts=None):
+    """
+    Vocabulary indices of the candidates, in the order they should be scored.
+    
+    The remaining targets come first: they may win outright, and as the search
+    keeps the first of equally good candidates, they also win ties.
+    
+    Args:
+        skip_mask (np.ndarray): (N,) True for words that must not be guessed
+        target_idx (np.ndarray): (M,) vocabulary indices of the remaining targets
+        vocab_counts (np.ndarray): Optional (N, 26) letter counts of the vocabulary;
+                                   words with more distinct letters then come first
+                                   within each group
+    
+    Returns:
+        np.ndarray: Indices of the words not in skip_mask
+    """
+    is_target = np.zeros(len(skip_mask), dtype=bool)
+    is_target[target_idx] = True
+    
+    candidate_idx = np.flatnonzero(~skip_mask)
+    rank = np.where(is_target[candidate_idx], 0, 8)
+    if vocab_counts is not None:
+        # Words with distinct letters tend to carry the most information
+        rank -= (vocab_counts[candidate_idx] > 0).sum(axis=1)
+    
+    return candidate_idx[np.argsort(rank, kind='stable')]
+
+
+def best_entropy(vocab_arr, vocab_counts, target_idx, skip_mask, xlogx, pattern_table=None):
+    """
+    Find the vocabulary word with the highest expected entropy against the targets.
+    
+    Candidates are scored in ordered_candidates order, and the search stops
+    as soon as one of them splits the targets as evenly as possible.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+        vocab_counts (np.ndarray): (N, 26) letter counts of the vocabulary
+        target_idx (np.ndarray): (M,) vocabulary indices of the remaining targets
+        skip_mask (np.ndarray): (N,) True for words that must not be guessed
+        xlogx (np.ndarray): Table from xlogx_table, covering counts up to M
+        pattern_table (np.memmap): Optional table from build_pattern_table
+    
+    Returns:
+        tuple: Vocabulary index of the best guess (the first one scored wins ties)
+               and its expected entropy
+    """
+    candidate_idx = ordered_candidates(skip_mask, target_idx, vocab_counts)
+    
+    # No guess can do better than spreading the targets evenly over the 243
+    # patterns (every target its own pattern when there are at most 243 of them)
+    num_targets = len(target_idx)
+    min_cost = num_targets * max(np.log2(num_targets / 243), 0.0)
+    
+    best_idx, best_cost = -1, np.inf
+    for block_idx, histograms in iter_histograms(vocab_arr, vocab_counts, target_idx,
+                                                 candidate_idx, BLOCK_GUESSES, pattern_table):
+        costs = split_costs(histograms, xlogx)
+        
+        block_best = costs.argmin()
+        if costs[block_best] < best_cost:
+            best_idx = block_idx[block_best]
+            best_cost = costs[block_best]
+        
+        if best_cost <= min_cost + 1e-9:
+            break
+    
+    return int(best_idx), float(np.log2(num_targets) - best_cost / num_targets)
+
+
+def best_worst_case(vocab_arr, vocab_counts, target_idx, skip_mask, pattern_table=None):
+    """
+    Find the vocabulary word whose largest pattern group is the smallest.
+    
+    Candidates are scored in ordered_candidates order, and the search stops
+    as soon as one of them reaches the smallest worst case any guess could have.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+        vocab_counts (np.ndarray): (N, 26) letter counts of the vocabulary
+        target_idx (np.ndarray): (M,) vocabulary indices of the remaining targets
+        skip_mask (np.ndarray): (N,) True for words that must not be guessed
+        pattern_table (np.memmap): Optional table from build_pattern_table
+    
+    Returns:
+        tuple: Vocabulary index of the best guess (the first one wins ties)
+               and its worst-case number of remaining targets
+    """
+    candidate_idx = ordered_candidates(skip_mask, target_idx, vocab_counts)
+    
+    # Some pattern group always holds at least ceil(M / 243) targets, so once a
+    # candidate gets down to that no later one can beat it
+    min_worst = max(-(-len(target_idx) // 243), 1)
+    
+    best_idx, best_worst = -1, np.inf
+    for block_idx, histograms in iter_histograms(vocab_arr, vocab_counts, target_idx,
+                                                 candidate_idx, BLOCK_GUESSES, pattern_table):
+        worst_case = histograms.max(axis=1)
+        
+        block_best = worst_case.argmin()
+        if worst_case[block_best] < best_worst:
+            best_idx = block_idx[block_best]
+            best_worst = worst_case[block_best]
+        
+        if best_worst <= min_worst:
+            break
+    
+    return int(best_idx), int(best_worst)
+
+
+def candidate_costs(vocab_arr, vocab_counts, target_idx, candidate_idx, xlogx, pattern_table=None):
+    """
+    split_costs of every candidate against the targets.
+    
+    Args:
+        vocab_arr (np.ndarray): (N, 5) letter codes of the vocabulary
+        vocab_counts (np.ndarray): (N, 26) letter counts of the vocabulary
+        target_idx (np.ndarray): (M,) vocabulary indices of the remaining targets
+        candidate_idx (np.ndarray): (G,) vocabulary indices of the candidates
+        xlogx (np.ndarray): Table from xlogx_table, covering counts up to M
+        pattern_table (np.memmap): Optional table from build_pattern_table
+    
+    Returns:
+        np.ndarray: (G,) cost of each candidate (lower cost = higher entropy)
+    """
+    return np.concatenate([
+        split_costs(histograms, xlogx)
+        for _, histograms in iter_histograms(vocab_arr, vocab_counts, target_idx,
+                                             candidate_idx, pattern_table=pattern_table)
+    ])
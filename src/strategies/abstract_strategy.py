@@ -1,13 +1,60 @@
 from abc import ABC, abstractmethod
+import numpy as np
+from ._kernels import (FEEDBACK_CODES, FEEDBACK_STRINGS, build_pattern_table, candidate_costs,
+                       encode_words, feedback_code, frequency_scores, load_pattern_table,
+                       pack_words, pattern_matrix, pattern_table_path, position_frequencies,
+                       repeated_letters, xlogx_table)
 
 class AbstractStrategy(ABC):
-    def __init__(self, vocabulary='data/allowed_words.txt'):
+    def __init__(self, vocabulary='data/allowed_words.txt', pattern_table=True, verbose=False):
         with open(vocabulary, 'r') as file:
             # Convert all words to lowercase for consistent comparison
-            self.vocabulary = [line.strip().lower() for line in file]
+            self.vocabulary = file.read().lower().split()
+        
+        # Encode the vocabulary as a contiguous (N, 5) matrix of letter codes (0-25)
+        # and the per-word letter counts, shape (N, 26)
+        self.vocab_arr, self.vocab_counts = encode_words(self.vocabulary)
+        
+        # Feedback of every (target, guess) pair, computed once and cached on disk
+        # so later strategies only map the file. pattern_table is the file to use,
+        # True for this vocabulary's file under cache/, or None to disable it.
+        if pattern_table is True:
+            pattern_table = pattern_table_path(self.vocab_arr)
+        
+        self.pattern_table = None
+        if pattern_table:
+            self.pattern_table = load_pattern_table(pattern_table, self.vocab_arr)
+            if self.pattern_table is None:
+                if verbose:
+                    print("Building the feedback pattern table...")
+                self.pattern_table = build_pattern_table(self.vocab_arr, self.vocab_counts,
+                                                         pattern_table)
+        
+        # Letter codes packed into one uint64 per word (byte i = letter i), shape (N,)
+        self.vocab_packed = pack_words(self.vocab_arr)
+        
+        # Bit i set when letter i occurs in the word, shape (N,)
+        self.vocab_mask = np.bitwise_or.reduce(
+            np.left_shift(1, self.vocab_arr, dtype=np.uint32), axis=1)
+        
+        # Positions whose letter already occurred earlier in the word, shape (N, 5)
+        self.vocab_repeats = repeated_letters(self.vocab_arr)
+        
+        self.word_to_idx = {word: i for i, word in enumerate(self.vocabulary)}
+        
+        # c * log2(c) for every possible pattern count, used to compute entropies
+        self.xlogx = xlogx_table(len(self.vocabulary))
             
-        # Initialize previous guesses tracking
+        # Initialize previous guesses tracking, as words and as a vocabulary mask
         self.previous_guesses = set()
+        self.guessed_mask = np.zeros(len(self.vocabulary), dtype=bool)
+        
+        # Second guess chosen after each (first guess, feedback code): the first guess
+        # is fixed, so these two determine the whole game state at that point
+        self.second_guesses = {}
+        
+        # Only print progress and errors when asked to, so bulk evaluation stays quiet
+        self.verbose = verbose
     
     def _generate_feedback(self, guess: str, target_word:str):
         """
@@ -22,99 +69,142 @@ class AbstractStrategy(ABC):
         guess = guess.lower()
         target_word = target_word.lower()
         
-        word_length = 5
-        feedback = ["_"] * word_length
+        # Compare letter codes with fixed 26-slot counts, then decode the pattern
+        code = feedback_code([ord(char) - ord('a') for char in guess],
+                             [ord(char) - ord('a') for char in target_word])
+        return FEEDBACK_STRINGS[code]
+    
+    def _frequency_scores(self, possible_idx):
+        """
+        Score every vocabulary word by how common its letters are, position by
+        position, among the possible words (duplicate letters are penalised).
         
-        # Count occurrences of each letter in the target word
-        letter_count = {}
-        for char in target_word:
-            if char in letter_count:
-                letter_count[char] += 1
-            else:
-                letter_count[char] = 1
+        Args:
+            possible_idx (np.ndarray): Vocabulary indices of the possible words
         
-        # First pass: Mark correct positions
-        for i in range(word_length):
-            if guess[i] == target_word[i]:
-                feedback[i] = "G"
-                letter_count[guess[i]] -= 1
+        Returns:
+            np.ndarray: (N,) frequency score of each vocabulary word
+        """
+        frequencies = position_frequencies(self.vocab_arr[possible_idx])
+        return frequency_scores(self.vocab_arr, self.vocab_repeats, frequencies)
+    
+    def _score_candidates(self, possible_idx, candidate_idx):
+        """
+        Frequency and entropy scores of the candidates, for strategies that
+        combine both.
         
-        # Second pass: Mark correct letters in wrong positions
-        for i in range(word_length):
-            if feedback[i] == "_" and guess[i] in letter_count and letter_count[guess[i]] > 0:
-                feedback[i] = "Y"
-                letter_count[guess[i]] -= 1
+        Args:
+            possible_idx (np.ndarray): Vocabulary indices of the possible words
+            candidate_idx (np.ndarray): Vocabulary indices of the candidate guesses
         
-        return ''.join(feedback)
-    
+        Returns:
+            tuple: (G,) frequency scores and (G,) split costs (lower cost = higher
+                   entropy) of the candidates
+        """
+        costs = candidate_costs(self.vocab_arr, self.vocab_counts, possible_idx, candidate_idx,
+                                self.xlogx, self.pattern_table)
+        return self._frequency_scores(possible_idx)[candidate_idx], costs
     
-    def _reduce_words_space(self, guess, possible_words, feedback):
+    def _reduce_words_space(self, guess, possible_idx, feedback):
         """
         Reduce the possible words space after getting feedback from a guess in Wordle.
         
         Args:
             guess (str): The word that was guessed (converted to lowercase)
-            possible_words (list): List of possible words before this guess
+            possible_idx (np.ndarray): Vocabulary indices of the possible words
+                                       before this guess, or None for the whole vocabulary
             feedback (list): Feedback for each letter, e.g. ['_', 'Y', 'G', '_', '_']
                             'G' = Green (correct letter, correct position)
                             'Y' = Yellow (correct letter, wrong position)
                             '_' = Gray (letter not in word)
         
         Returns:
-            list: Reduced list of possible words
+            np.ndarray: Vocabulary indices (int32) of the remaining possible words
         """
         # Convert guess to lowercase for consistency
         guess = guess.lower()
-        new_word_space = possible_words.copy()
         
-        # First pass: Handle 'G' (green) matches
-        for i, sign in enumerate(feedback):
-            if sign == 'G':
-                new_word_space = [word for word in new_word_space if guess[i] == word[i]]
+        if possible_idx is None:
+            possible_idx = np.arange(len(self.vocabulary), dtype=np.int32)
+        
+        if self.pattern_table is not None and guess in self.word_to_idx:
+            # The surviving words are exactly those that would have produced this
+            # feedback: one lookup per word in the guess's column of the table
+            code = FEEDBACK_CODES[''.join(feedback)]
+            keep = self.pattern_table[possible_idx, self.word_to_idx[guess]] == code
+        else:
+            keep = self._feedback_mask(guess, possible_idx, feedback)
+        
+        return possible_idx[keep]
+           
+    def _feedback_mask(self, guess, possible_idx, feedback):
+        """
+        Check the possible words against the constraints implied by the feedback.
+        
+        Args:
+            guess (str): The word that was guessed (lowercase)
+            possible_idx (np.ndarray): Vocabulary indices of the possible words
+            feedback (list): Feedback for each letter, as in _reduce_words_space
+        
+        Returns:
+            np.ndarray: Boolean mask of the possible words consistent with the feedback
+        """
+        letters = np.frombuffer(guess.encode(), dtype=np.uint8) - ord('a')
         
-        # Second pass: Handle 'Y' (yellow) matches
+        # Positions: 'G' pins the letter, otherwise the guessed letter cannot sit there.
+        # XOR-ing the packed words with the packed guess leaves a zero byte exactly
+        # where the letters match, so all greens are checked with a single mask.
+        diff = self.vocab_packed[possible_idx] ^ pack_words(letters[None])[0]
+        green_bytes = sum(0xFF << (8 * i) for i, sign in enumerate(feedback) if sign == 'G')
+        keep = (diff & np.uint64(green_bytes)) == 0
         for i, sign in enumerate(feedback):
-            if sign == 'Y':
-                # Letter is in the word but not at this position
-                new_word_space = [word for word in new_word_space if 
-                                (guess[i] in word and guess[i] != word[i])]
-        
-        # Third pass: Handle '_' (gray/blank) - letter not in word
-        # We need to be careful with this because duplicate letters
-        # might be marked as gray if they appear more times in the guess
-        # than in the actual word
-        gray_letters = {guess[i] for i, sign in enumerate(feedback) if sign == '_'}
-        
-        # For each gray letter, we need to check if it appears elsewhere as green or yellow
-        for gray_letter in gray_letters:
-            # Count how many times this letter appears as green or yellow
-            green_yellow_count = sum(1 for i, sign in enumerate(feedback) 
-                                if (sign == 'G' or sign == 'Y') and guess[i] == gray_letter)
+            if sign != 'G':
+                keep &= (diff & np.uint64(0xFF << (8 * i))) != 0
+        
+        # Letter counts: each 'G'/'Y' proves one occurrence of the letter, and a
+        # '_' on the same letter means there are no further occurrences
+        absent_bits = 0
+        required_bits = 0
+        for letter in set(letters.tolist()):
+            signs = [sign for i, sign in enumerate(feedback) if letters[i] == letter]
+            green_yellow_count = sum(1 for sign in signs if sign != '_')
             
-            # If it never appears as green or yellow, it's not in the word
             if green_yellow_count == 0:
-                new_word_space = [word for word in new_word_space if gray_letter not in word]
+                absent_bits |= 1 << letter
+                continue
+            
+            if '_' in signs:
+                keep &= self.vocab_counts[possible_idx, letter] == green_yellow_count
+            elif green_yellow_count > 1:
+                keep &= self.vocab_counts[possible_idx, letter] >= green_yellow_count
             else:
-                # If it appears as green or yellow, then the allowed count is exactly that number
-                for word in new_word_space.copy():
-                    if word.count(gray_letter) > green_yellow_count:
-                        new_word_space.remove(word)
+                required_bits |= 1 << letter
         
-        return new_word_space
+        # Presence/absence checks for all remaining letters at once on the letter bitmasks
+        letter_masks = self.vocab_mask[possible_idx]
+        keep &= (letter_masks & absent_bits) == 0
+        keep &= (letter_masks & required_bits) == required_bits
+        
+        return keep
            
     def solve(self, game):
-        possible_words = self.vocabulary.copy()
+        # The word space is tracked as vocabulary indices. The first guess is fixed,
+        # so it is only materialised once the first feedback has narrowed it down
+        # (None = whole vocabulary)
+        possible_idx = None
         attempts = 0
         self.previous_guesses = set()
+        self.guessed_mask[:] = False
+        opening = None
         
         # Get the game's max attempts
         max_attempts = 6  # Standard Wordle limit
         
         while attempts < max_attempts:
-            guess = self.choose_best_guess(possible_words, attempts)
+            guess = self._choose_guess(possible_idx, attempts, opening)
             
             # Add to our set of previous guesses BEFORE making the guess
-            self.previous_guesses.add(guess)
+            self._add_guess(guess)
             
             attempts += 1 
             
@@ -122,31 +212,40 @@ class AbstractStrategy(ABC):
             
             # Check for errors
             if error_msg:
-                print(f"Error: {error_msg}")
+                if self.verbose:
+                    print(f"Error: {error_msg}")
+                
+                # Nothing was learned, so later turns choose from the whole vocabulary
+                if possible_idx is None:
+                    possible_idx = np.arange(len(self.vocabulary), dtype=np.int32)
                 continue
                 
             # Check for correct guess
             if is_correct:
                 return guess, attempts
             
+            if attempts == 1:
+                opening = (guess, FEEDBACK_CODES[''.join(feedback)])
+            
             # Reduce the search space based on feedback
-            possible_words = self._reduce_words_space(guess, possible_words, feedback)
+            possible_idx = self._reduce_words_space(guess, possible_idx, feedback)
             
             # If we've run out of possible words, something went wrong
-            if len(possible_words) == 0:
-                print("Error: No possible words left in the word space!")
+            if len(possible_idx) == 0:
+                if self.verbose:
+                    print("Error: No possible words left in the word space!")
                 return None, attempts
                 
             # If only one word remains and we still have attempts, just guess it
-            if len(possible_words) == 1 and attempts < max_attempts:
-                final_guess = possible_words[0]
+            if len(possible_idx) == 1 and attempts < max_attempts:
+                final_guess = self.vocabulary[possible_idx[0]]
                 
                 # Skip if we already tried this word
                 if final_guess in self.previous_guesses and final_guess != guess:
                     continue
                     
                 # Otherwise make this our final guess
-                self.previous_guesses.add(final_guess)
+                self._add_guess(final_guess)
                 attempts += 1
                 is_correct, _, error_msg = game.make_guess(final_guess)
                 
@@ -157,7 +256,149 @@ class AbstractStrategy(ABC):
         
         return None, attempts
     
+    def solve_batch(self, targets):
+        """
+        Solve many games at once, making the same guesses as solve() would.
+        
+        Games are advanced turn by turn. Games with the same guesses and feedback
+        so far are in the same state, so the next guess is chosen once per group
+        of such games (a single group on the first turn) and every game in the
+        group is scored against it together.
+        
+        Args:
+            targets (list): Target word of each game (5 letters, need not be in
+                            the vocabulary)
+        
+        Returns:
+            list: (final guess or None, number of guesses made) for each game
+        """
+        targets = [word.lower() for word in targets]
+        
+        # Targets outside the vocabulary (index -1) get their feedback computed
+        # from their letter codes instead of looked up in the pattern table
+        target_arr, target_counts = encode_words(targets)
+        target_idx = np.array([self.word_to_idx.get(word, -1) for word in targets], dtype=np.int32)
+        results = [None] * len(targets)
+        
+        # Standard Wordle limit
+        max_attempts = 6
+        
+        # Groups of games in the same state: possible words, game numbers, guesses
+        # so far and the first guess with its feedback code
+        groups = [(None, np.arange(len(targets)), [], None)]
+        
+        for attempts in range(max_attempts):
+            next_groups = []
+            
+            for possible_idx, games, guesses, opening in groups:
+                # Give choose_best_guess the guess history of this group
+                self.previous_guesses = set(guesses)
+                self.guessed_mask[:] = False
+                self.guessed_mask[[self.word_to_idx[word] for word in guesses]] = True
+                
+                guess = self._choose_guess(possible_idx, attempts, opening)
+                codes = self._feedback_codes(guess, target_idx[games], target_arr[games],
+                                             target_counts[games])
+                
+                # Split the games by the feedback they got
+                feedbacks, group_of_game = np.unique(codes, return_inverse=True)
+                for i, code in enumerate(feedbacks):
+                    group_games = games[group_of_game == i]
+                    
+                    if code == len(FEEDBACK_STRINGS) - 1:
+                        for game in group_games:
+                            results[game] = (guess, attempts + 1)
+                        continue
+                    
+                    # Reduce the search space based on feedback
+                    group_possible = self._reduce_words_space(
+                        guess, possible_idx, list(FEEDBACK_STRINGS[code]))
+                    
+                    # If we've run out of possible words, something went wrong
+                    if len(group_possible) == 0:
+                        for game in group_games:
+                            results[game] = (None, attempts + 1)
+                        continue
+                    
+                    # If only one word remains and we still have attempts, just guess it
+                    final_guess = self.vocabulary[group_possible[0]]
+                    if (len(group_possible) == 1 and attempts + 1 < max_attempts
+                            and final_guess not in guesses):
+                        for game in group_games:
+                            solved = final_guess == targets[game]
+                            results[game] = (final_guess if solved else None, attempts + 2)
+                        continue
+                    
+                    next_groups.append((group_possible, group_games, guesses + [guess],
+                                        opening or (guess, code)))
+            
+            groups = next_groups
+        
+        # Games still unsolved after the last attempt
+        for _, games, _, _ in groups:
+            for game in games:
+                results[game] = (None, max_attempts)
+        
+        return results
+    
+    def _choose_guess(self, possible_idx, attempts, opening):
+        """
+        choose_best_guess, remembering the second guess of each opening.
+        
+        Args:
+            possible_idx (np.ndarray): Vocabulary indices of the possible words
+            attempts (int): Number of guesses made so far
+            opening (tuple): First guess and its feedback code, once known
+        
+        Returns:
+            str: The word to guess
+        """
+        if attempts != 1 or opening is None:
+            return self.choose_best_guess(possible_idx, attempts)
+        
+        if opening not in self.second_guesses:
+            self.second_guesses[opening] = self.choose_best_guess(possible_idx, attempts)
+        return self.second_guesses[opening]
+    
+    def _feedback_codes(self, guess, target_idx, target_arr, target_counts):
+        """
+        Feedback pattern codes of a guess against several targets.
+        
+        Args:
+            guess (str): The word that was guessed (lowercase)
+            target_idx (np.ndarray): Vocabulary indices of the targets, -1 for
+                                     targets outside the vocabulary
+            target_arr (np.ndarray): (M, 5) letter codes of the targets
+            target_counts (np.ndarray): (M, 26) letter counts of the targets
+        
+        Returns:
+            np.ndarray: Pattern code of each target, see FEEDBACK_STRINGS
+        """
+        if (self.pattern_table is not None and guess in self.word_to_idx
+                and (target_idx >= 0).all()):
+            return self.pattern_table[target_idx, self.word_to_idx[guess]]
+        
+        letters = np.frombuffer(guess.encode(), dtype=np.uint8)[None] - ord('a')
+        return pattern_matrix(letters, target_arr, target_counts)[0]
+    
+    def _add_guess(self, guess):
+        """Record a guess so it is not chosen again in this game."""
+        self.previous_guesses.add(guess)
+        if guess in self.word_to_idx:
+            self.guessed_mask[self.word_to_idx[guess]] = True
+    
     @abstractmethod
-    def choose_best_guess(self, possible_words, attempts):
+    def choose_best_guess(self, possible_idx, attempts):
+        """
+        Pick the next guess.
+        
+        Args:
+            possible_idx (np.ndarray): Vocabulary indices of the possible words
+                                       (None before the first guess)
+            attempts (int): Number of guesses made so far
+        
+        Returns:
+            str: The word to guess
+        """
         pass
 
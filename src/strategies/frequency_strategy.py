@@ -1,52 +1,23 @@
 from .abstract_strategy import AbstractStrategy
-from collections import defaultdict
+import numpy as np
 
 class FrequencyBasedStrategy(AbstractStrategy):
     
-    def choose_best_guess(self, possible_words, attempts):
+    def choose_best_guess(self, possible_idx, attempts):
         
         if attempts == 0:
             return 'cares' # pre-computed optimal first guess
         
         # If there's only one possibility, return it immediately
-        if len(possible_words) == 1:
-            return possible_words[0]
+        if len(possible_idx) == 1:
+            return self.vocabulary[possible_idx[0]]
         
-        # Calculate letter frequencies in each position
-        position_frequencies = [defaultdict(int) for _ in range(5)]
+        # Score ALL vocabulary words by their position-specific letter frequencies,
+        # reducing the score for duplicate letters
+        scores = self._frequency_scores(possible_idx)
         
-        # Count frequency of each letter at each position
-        for word in possible_words:
-            for position, letter in enumerate(word):
-                position_frequencies[position][letter] += 1
+        # Skip words we've already guessed
+        scores[self.guessed_mask] = -np.inf
         
-        best_score = -1
-        best_guess = None
-        
-        # Consider ALL vocabulary words as potential guesses
-        # but skip words we've already guessed
-        for candidate_word in self.vocabulary:
-            
-            # Skip words we've already guessed
-            if candidate_word in self.previous_guesses:
-                continue
-            
-            # Calculate score based on position-specific letter frequencies
-            score = 0
-            seen_letters = set()  # To track duplicate letters
-            
-            for position, letter in enumerate(candidate_word):
-                # Add position-specific frequency
-                score += position_frequencies[position][letter]
-                
-                # Optional: Penalize duplicate letters
-                if letter in seen_letters:
-                    score *= 0.8  # Reduce score for duplicate letters
-                seen_letters.add(letter)
-            
-            # Update best guess if this one has a higher score
-            if score > best_score:
-                best_score = score
-                best_guess = candidate_word
-
-        return best_guess
\ No newline at end of file
+        # First word with the highest score
+        return self.vocabulary[np.argmax(scores)]
@@ -1,45 +1,28 @@
 from .abstract_strategy import AbstractStrategy
+from ._kernels import best_worst_case
 
 
 class MinimaxBasedStrategy(AbstractStrategy):
     
-    def choose_best_guess(self, possible_words, attempts):
+    def choose_best_guess(self, possible_idx, attempts):
         
         if attempts == 0:
             return 'serai'  # pre-computed optimal first guess
         
         # If there's only one possibility, return it immediately
-        if len(possible_words) == 1:
-            return possible_words[0]
+        if len(possible_idx) == 1:
+            return self.vocabulary[possible_idx[0]]
             
-        best_worst_case = float('inf')
-        best_guess = None
-        
         # Consider ALL vocabulary words as potential guesses
         # but skip words we've already guessed
-        for candidate_word in self.vocabulary:
-            
-            # Skip words we've already guessed
-            if candidate_word in self.previous_guesses:
-                continue
-                
-            feedback_patterns = {}
-            
-            # But only evaluate against remaining possible solutions
-            for target_word in possible_words:
-                pattern = self._generate_feedback(candidate_word, target_word)
-                
-                if pattern not in feedback_patterns:
-                    feedback_patterns[pattern] = 0
-                feedback_patterns[pattern] += 1
-            
-            # Find the worst-case scenario for this candidate
-            worst_case = max(num_remaining_words for num_remaining_words in feedback_patterns.values())
-            
-            # If this candidate's worst case is better than our best so far
-            if worst_case < best_worst_case:
-                best_worst_case = worst_case
-                best_guess = candidate_word
-                
-        print(f"Best guess: {best_guess}")
+        skip_mask = self.guessed_mask
+        
+        # Candidate whose largest pattern group (worst case) is the smallest,
+        # scored against every remaining possible solution in batches
+        best_idx, _ = best_worst_case(self.vocab_arr, self.vocab_counts, possible_idx, skip_mask,
+                                      self.pattern_table)
+        best_guess = self.vocabulary[best_idx]
+        
+        if self.verbose:
+            print(f"Best guess: {best_guess}")
         return best_guess
\ No newline at end of file
@@ -10,25 +10,30 @@ class Wordle:
         self.guesses = []
         self.feedbacks = []
         
-        # Use a small built-in list of words
+        # Load both word lists with a single read and split each
         with open(allowed_words, "r") as file:
-            self.word_list = [line.strip() for line in file]
+            self.word_list = file.read().split()
             
         with open(possible_words, "r") as file:
-            self.target_word_list = [line.strip() for line in file]
+            self.target_word_list = file.read().split()
         
         if target_word is None:
             # Select a random target word
-            self.target_word = random.choice(self.target_word_list)
-        else:
-            self.target_word = target_word
+            target_word = random.choice(self.target_word_list)
+        self._set_target(target_word)
+            
+    def _set_target(self, target_word):
+        """Set the target word and count its letters once for all the game's feedbacks"""
+        self.target_word = target_word
+        self.target_letter_count = {}
+        for char in target_word:
+            self.target_letter_count[char] = self.target_letter_count.get(char, 0) + 1
             
     def reset_game(self, target_word=None):
         """Reset the game with a new word"""
         if target_word is None:
-            self.target_word = random.choice(self.target_word_list)
-        else:
-            self.target_word = target_word
+            target_word = random.choice(self.target_word_list)
+        self._set_target(target_word)
         self.attempts = 0
         self.guesses = []
         self.feedbacks = []
@@ -78,13 +83,8 @@ class Wordle:
         """
         feedback = ["_"] * self.word_length
         
-        # Count occurrences of each letter in the target word
-        letter_count = {}
-        for char in self.target_word:
-            if char in letter_count:
-                letter_count[char] += 1
-            else:
-                letter_count[char] = 1
+        # Occurrences of each letter in the target word, counted when it was set
+        letter_count = self.target_letter_count.copy()
         
         # First pass: Mark correct positions
         for i in range(self.word_length):
@@ -94,7 +94,7 @@ class Wordle:
         
         # Second pass: Mark correct letters in wrong positions
         for i in range(self.word_length):
-            if feedback[i] == "_" and guess[i] in letter_count and letter_count[guess[i]] > 0:
+            if feedback[i] == "_" and letter_count.get(guess[i], 0) > 0:
                 feedback[i] = "Y"
                 letter_count[guess[i]] -= 1
         